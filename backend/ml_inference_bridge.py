@@ -1,97 +1,219 @@
 """
 XGBoost Inference Bridge for Node.js
+Runs the ensemble's ONNX exports on ONNX Runtime.
 Reads features from stdin JSON, outputs prediction JSON to stdout
 """
-import pickle
+import ctypes
+import os
+import queue
 import sys
-import json
+import threading
 import warnings
 from pathlib import Path
 import numpy as np
+import onnxruntime as ort
+import orjson
 
 warnings.filterwarnings('ignore')
 
 MODELS_DIR = Path(r'C:/Users/shaya/Desktop/Projects/Mosaic Protocol/ml-training/trained/models/ensemble')
+N_FEATURES = 68
+MAX_BATCH = 64  # Max stdin lines scored in one session run
+PIN_CPU = os.environ.get('ML_BRIDGE_PIN_CPU', '1') != '0'  # Set to 0 when batch scoring on shared hosts
+
+# Severity tiers: probability >= SEVERITY_THRESHOLDS[i - 1] falls in SEVERITY_TIERS[i]
+SEVERITY_THRESHOLDS = np.array([0.007, 0.15, 0.50])
+SEVERITY_TIERS = (
+    ('SAFE', 'No significant issues detected.'),
+    ('LOW', 'Minor risk or code complexity warning.'),
+    ('HIGH', 'Suspicious patterns found. Manual review recommended.'),
+    ('CRITICAL', 'High confidence exploit detected. Immediate review required.'),
+)
+
+# Preallocated input rows, filled in place for every batch
+X = np.empty((MAX_BATCH, N_FEATURES), dtype=np.float32)
+
+# Preallocated outputs of the fused ensemble graph, one score per row of X
+SCORES = {name: np.empty(MAX_BATCH, dtype=np.float32) for name in ('probability', 'recall_score', 'precision_score')}
+
+def is_fresh(path, source):
+    """Check that a derived model file exists and is not older than its source"""
+    return path.exists() and (not source.exists() or path.stat().st_mtime >= source.stat().st_mtime)
+
+def pin_cpu():
+    """Pin the process to one core so the single-threaded session never migrates"""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})
+    elif sys.platform == 'win32':
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetProcessAffinityMask(kernel32.GetCurrentProcess(), 1)
+
+def create_session(onnx_path):
+    """Create an ORT session that scores rows of X into the preallocated SCORES buffers"""
+    so = ort.SessionOptions()
+    # A 68-float row is cheaper to score than a thread pool wake-up: run strictly serial
+    so.intra_op_num_threads = 1
+    so.inter_op_num_threads = 1
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    so.add_session_config_entry('session.intra_op.allow_spinning', '0')
+    so.add_session_config_entry('session.disable_prepacking', '0')
+    
+    # Graph optimization dominates session creation, so only pay for it once
+    ort_path = onnx_path.with_suffix('.ort')
+    opt_path = onnx_path.with_suffix('.opt.onnx')
+    if is_fresh(ort_path, onnx_path):
+        # Pre-optimized ORT format written by convert_all.py
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        so.add_session_config_entry('session.load_model_format', 'ORT')
+        model_path = ort_path
+    elif is_fresh(opt_path, onnx_path):
+        # Optimized graph saved by an earlier bridge start
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        model_path = opt_path
+    else:
+        # EXTENDED keeps the saved graph free of hardware-specific layout transforms
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        so.optimized_model_filepath = str(opt_path)
+        model_path = onnx_path
+    
+    sess = ort.InferenceSession(str(model_path), so, providers=['CPUExecutionProvider'])
+    input_name = sess.get_inputs()[0].name
+    
+    io = sess.io_binding()
+    
+    def run(n):
+        # Rebinding only sets the batch shape - all buffers are reused
+        io.bind_cpu_input(input_name, X[:n])
+        for name, scores in SCORES.items():
+            io.bind_output(name, 'cpu', 0, np.float32, [n], scores.ctypes.data)
+        sess.run_with_iobinding(io)
+    
+    return run
 
 def load_models():
-    """Load both ensemble models"""
+    """Load the fused ensemble (both models and their weighted blend in one graph)"""
     models = {}
+    models['ensemble'] = create_session(MODELS_DIR / 'ensemble_model.onnx')
+    return models
+
+def predict(models, n):
+    """Run ensemble prediction with severity tiers over the first n rows of X"""
+    # One run scores the whole batch: P(vulnerable) per model and the weighted ensemble
+    models['ensemble'](n)
+    probability = SCORES['probability'][:n]
+    recall_proba = SCORES['recall_score'][:n]
+    precision_proba = SCORES['precision_score'][:n]
     
-    recall_path = MODELS_DIR / 'ensemble_recall_model.pkl'
-    with open(recall_path, 'rb') as f:
-        models['recall'] = pickle.load(f)
+    # Classify severity for the whole batch at once
+    tiers = np.searchsorted(SEVERITY_THRESHOLDS, probability, side='right')
     
-    precision_path = MODELS_DIR / 'ensemble_precision_model.pkl'
-    with open(precision_path, 'rb') as f:
-        models['precision'] = pickle.load(f)
+    results = []
+    for i in range(n):
+        severity, severity_message = SEVERITY_TIERS[tiers[i]]
+        
+        results.append({
+            'probability': float(probability[i]),
+            'recall_score': float(recall_proba[i]),
+            'precision_score': float(precision_proba[i]),
+            'is_vulnerable': bool(tiers[i] > 0),
+            'severity': severity,
+            'severity_message': severity_message,
+            'threshold': 0.007
+        })
     
-    return models
+    return results
 
-def classify_severity(probability):
-    """Classify probability into severity tier"""
-    if probability >= 0.50:
-        return 'CRITICAL', 'High confidence exploit detected. Immediate review required.'
-    elif probability >= 0.15:
-        return 'HIGH', 'Suspicious patterns found. Manual review recommended.'
-    elif probability >= 0.007:
-        return 'LOW', 'Minor risk or code complexity warning.'
-    else:
-        return 'SAFE', 'No significant issues detected.'
+def emit(*objs):
+    """Write JSON lines to stdout as raw bytes in a single write"""
+    sys.stdout.buffer.write(b''.join(orjson.dumps(obj) + b'\n' for obj in objs))
+    sys.stdout.buffer.flush()
+
+def read_stdin(lines):
+    """Feed raw stdin lines into the queue, followed by None at EOF"""
+    for line in sys.stdin.buffer:
+        lines.put(line)
+    lines.put(None)
+
+def next_batch(lines):
+    """Block for one line, then drain whatever else has already arrived"""
+    batch = [lines.get()]
+    while batch[-1] is not None and len(batch) < MAX_BATCH:
+        try:
+            batch.append(lines.get_nowait())
+        except queue.Empty:
+            break
+    return batch
 
-def predict(models, features):
-    """Run ensemble prediction with severity tiers"""
-    # Convert features to numpy array
-    X = np.array(features).reshape(1, -1)
+def handle_batch(models, batch):
+    """
+    Parse a batch of request lines and answer them in FIFO order.
+    Each response echoes its request's id so concurrent callers can match them.
+    """
+    responses = [None] * len(batch)
+    ids = [None] * len(batch)
+    rows = []  # Response slot for each filled row of X
     
-    # Get probability predictions
-    recall_proba = models['recall'].predict_proba(X)[0][1]  # P(vulnerable)
-    precision_proba = models['precision'].predict_proba(X)[0][1]
+    for i, line in enumerate(batch):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            data = orjson.loads(line)
+            ids[i] = data.get('id')
+            features = data.get('features', [])
+            
+            if len(features) != N_FEATURES:
+                responses[i] = {'error': f'Expected {N_FEATURES} features, got {len(features)}'}
+                continue
+            
+            X[len(rows), :] = features
+            rows.append(i)
+            
+        except orjson.JSONDecodeError as e:
+            responses[i] = {'error': f'Invalid JSON: {e}'}
+        except Exception as e:
+            responses[i] = {'error': str(e)}
     
-    # Weighted ensemble
-    probability = 0.7 * recall_proba + 0.3 * precision_proba
+    if rows:
+        try:
+            for i, result in zip(rows, predict(models, len(rows))):
+                responses[i] = result
+        except Exception as e:
+            for i in rows:
+                responses[i] = {'error': str(e)}
     
-    # Classify severity
-    severity, severity_message = classify_severity(probability)
+    for i, response in enumerate(responses):
+        if response is not None and ids[i] is not None:
+            response['id'] = ids[i]
     
-    return {
-        'probability': float(probability),
-        'recall_score': float(recall_proba),
-        'precision_score': float(precision_proba),
-        'is_vulnerable': bool(probability >= 0.007),
-        'severity': severity,
-        'severity_message': severity_message,
-        'threshold': 0.007
-    }
+    return [r for r in responses if r is not None]
 
 def main():
-    """Main inference loop - read JSON from stdin, output prediction"""
+    """Main inference loop - read JSON lines from stdin, output predictions in order"""
     try:
+        if PIN_CPU:
+            pin_cpu()
         models = load_models()
-        print(json.dumps({'status': 'ready', 'models': 2}), flush=True)
+        emit({'status': 'ready', 'models': 2})
         
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
+        # Lines queue up while a batch is being scored and are picked up together next round
+        lines = queue.Queue()
+        threading.Thread(target=read_stdin, args=(lines,), daemon=True).start()
+        
+        while True:
+            batch = next_batch(lines)
+            eof = batch[-1] is None
+            if eof:
+                batch.pop()
             
-            try:
-                data = json.loads(line)
-                features = data.get('features', [])
-                
-                if len(features) != 68:
-                    print(json.dumps({'error': f'Expected 68 features, got {len(features)}'}), flush=True)
-                    continue
-                
-                result = predict(models, features)
-                print(json.dumps(result), flush=True)
-                
-            except json.JSONDecodeError as e:
-                print(json.dumps({'error': f'Invalid JSON: {e}'}), flush=True)
-            except Exception as e:
-                print(json.dumps({'error': str(e)}), flush=True)
+            emit(*handle_batch(models, batch))
+            
+            if eof:
+                break
                 
     except Exception as e:
-        print(json.dumps({'error': f'Failed to load models: {e}'}), flush=True)
+        emit({'error': f'Failed to load models: {e}'})
         sys.exit(1)
 
 if __name__ == '__main__':
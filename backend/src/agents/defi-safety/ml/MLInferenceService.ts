@@ -172,7 +172,7 @@ class MLInferenceService {
     private pythonReadline: readline.Interface | null = null;
     private initialized = false;
     private pythonAvailable = false;
-    private pendingRequests: Map<number, { resolve: (value: MLPrediction) => void; reject: (error: Error) => void }> = new Map();
+    private pendingRequests: Map<number, { resolve: (value: MLPrediction) => void; sourceCode: string; timeout: NodeJS.Timeout }> = new Map();
     private requestId = 0;
 
     /**
@@ -254,11 +254,11 @@ class MLInferenceService {
                         clearTimeout(timeout);
                         console.log('Python bridge ready:', data);
                         resolve();
+                    } else if (data.id !== undefined) {
+                        // Prediction (or per-request error) for one pending request
+                        this.handlePythonResponse(data);
                     } else if (data.error) {
                         console.warn('Python bridge error:', data.error);
-                    } else {
-                        // This is a prediction response
-                        this.handlePythonResponse(data);
                     }
                 } catch {
                     // Ignore non-JSON output
@@ -287,22 +287,29 @@ class MLInferenceService {
     /**
      * Handle Python response
      */
-    private handlePythonResponse(data: { probability?: number; recall_score?: number; precision_score?: number; is_vulnerable?: boolean; error?: string }, sourceCode?: string): void {
-        // Single-request model - resolve all pending
-        for (const [, { resolve }] of this.pendingRequests.entries()) {
-            if (data.probability !== undefined) {
-                const prediction = buildPrediction(
-                    data.probability,
-                    data.recall_score || 0,
-                    data.precision_score || 0,
-                    this.config.threshold,
-                    'python',
-                    sourceCode
-                );
-                resolve(prediction);
-            }
+    private handlePythonResponse(data: { id: number; probability?: number; recall_score?: number; precision_score?: number; is_vulnerable?: boolean; error?: string }): void {
+        // The bridge scores requests in batches; each response echoes its request id
+        const pending = this.pendingRequests.get(data.id);
+        if (!pending) return; // Already timed out
+
+        this.pendingRequests.delete(data.id);
+        clearTimeout(pending.timeout);
+
+        if (data.probability === undefined) {
+            console.warn('Python prediction error, falling back to heuristics:', data.error);
+            pending.resolve(this.predictLocal(pending.sourceCode));
+            return;
         }
-        this.pendingRequests.clear();
+
+        const prediction = buildPrediction(
+            data.probability,
+            data.recall_score || 0,
+            data.precision_score || 0,
+            this.config.threshold,
+            'python',
+            pending.sourceCode
+        );
+        pending.resolve(prediction);
     }
 
     /**
@@ -343,9 +350,8 @@ class MLInferenceService {
         const features = this.extractFeatures(sourceCode);
         const featureVector = getModelFeatureVector(features);
 
-        return new Promise((resolve, reject) => {
+        return new Promise((resolve) => {
             const id = ++this.requestId;
-            this.pendingRequests.set(id, { resolve, reject });
 
             const timeout = setTimeout(() => {
                 this.pendingRequests.delete(id);
@@ -353,7 +359,9 @@ class MLInferenceService {
                 resolve(this.predictLocal(sourceCode));
             }, 5000);
 
-            const request = JSON.stringify({ features: featureVector }) + '\n';
+            this.pendingRequests.set(id, { resolve, sourceCode, timeout });
+
+            const request = JSON.stringify({ id, features: featureVector }) + '\n';
 
             this.pythonProcess!.stdin!.write(request, (err) => {
                 if (err) {
@@ -4,7 +4,8 @@
  * No caching, no simulation - real cryptographic proofs bound to actual outputs.
  */
 
-import { spawn } from 'child_process';
+import { spawn, ChildProcess } from 'child_process';
+import * as readline from 'readline';
 import * as path from 'path';
 import * as fs from 'fs';
 import { fileURLToPath } from 'url';
@@ -37,22 +38,27 @@ function getPythonPath(): string {
     return process.platform === 'win32' ? 'python' : 'python3';
 }
 
+// SRS is keyed by logrows, matching models/ezkl_srs.py
+function srsLogrows(): number {
+    try {
+        const settings = JSON.parse(fs.readFileSync(path.join(MODELS_DIR, 'settings.json'), 'utf-8'));
+        return settings.run_args?.logrows ?? 17;
+    } catch {
+        return 17;
+    }
+}
+
 // Check if EZKL environment is available
 const hasCompiledModel = fs.existsSync(path.join(MODELS_DIR, 'model.compiled'));
 const hasProvingKey = fs.existsSync(path.join(MODELS_DIR, 'pk.key'));
 const hasVerificationKey = fs.existsSync(path.join(MODELS_DIR, 'vk.key'));
-const hasSRS = fs.existsSync(path.join(MODELS_DIR, 'kzg_17.srs')) || fs.existsSync(path.join(MODELS_DIR, 'kzg.srs'));
+const hasSRS = fs.existsSync(path.join(MODELS_DIR, `kzg_${srsLogrows()}.srs`));
 const hasVenv = fs.existsSync(EZKL_VENV_DIR);
 
 const EZKL_AVAILABLE = hasCompiledModel && hasProvingKey && hasVerificationKey && hasSRS;
 
 export interface EZKLProofResult {
     success: boolean;
-    proof?: {
-        protocol: string | null;
-        instances: string[][];
-        proof: number[];
-    };
     proofHex?: string;
     instances?: bigint[];
     outputHash?: string;
@@ -113,36 +119,73 @@ export async function generateFreshProof(
     }
 }
 
+// Persistent prover worker (dynamic_proof.py --serve), shared by all proof requests
+let proverProcess: ChildProcess | null = null;
+let proverReady: Promise<boolean> | null = null;
+const pendingProofs: Map<number, (result: EZKLProofResult) => void> = new Map();
+let nextProofId = 0;
+
+// Worker startup maps and warms pk.key/SRS; proofs can take a while under load
+const PROVER_START_TIMEOUT_MS = 120000;
+const PROOF_TIMEOUT_MS = 120000;
+
 /**
- * Call the Python EZKL prover script
+ * Start the persistent Python prover, or reuse the one already running
  */
-async function callPythonProver(
-    agentOutput: string,
-    jobId: string
-): Promise<EZKLProofResult> {
-    return new Promise((resolve) => {
+function startProver(): Promise<boolean> {
+    if (proverReady) return proverReady;
+    
+    proverReady = new Promise((resolve) => {
         const pythonCmd = getPythonPath();
         
-        console.log(`   📞 Calling ${PYTHON_SCRIPT}...`);
+        console.log(`   📞 Starting ${PYTHON_SCRIPT} --serve...`);
         console.log(`   🐍 Python: ${pythonCmd}`);
         
-        const proc = spawn(pythonCmd, [
-            PYTHON_SCRIPT,
-            agentOutput.slice(0, 10000), // Limit output size for CLI
-            jobId
-        ], {
+        const proc = spawn(pythonCmd, [PYTHON_SCRIPT, '--serve'], {
             cwd: MODELS_DIR,
             env: {
                 ...process.env,
                 PYTHONUNBUFFERED: '1'
             }
         });
+        proverProcess = proc;
+        
+        // A worker that never reports ready is killed; 'close' then resets state
+        const startTimer = setTimeout(() => {
+            console.error(`   ❌ Python prover not ready after ${PROVER_START_TIMEOUT_MS / 1000} seconds`);
+            proc.kill();
+            resolve(false);
+        }, PROVER_START_TIMEOUT_MS);
+        
+        // EPIPE from a worker that just died; 'close' fails the in-flight proofs
+        proc.stdin?.on('error', (err) => {
+            console.error(`   ❌ Python prover stdin error: ${err.message}`);
+        });
         
-        let stdout = '';
-        let stderr = '';
+        const lines = readline.createInterface({ input: proc.stdout, crlfDelay: Infinity });
         
-        proc.stdout.on('data', (data) => {
-            stdout += data.toString();
+        lines.on('line', (line) => {
+            let data;
+            try {
+                data = JSON.parse(line);
+            } catch {
+                return; // Ignore non-JSON output
+            }
+            
+            if (data.status === 'ready') {
+                clearTimeout(startTimer);
+                resolve(true);
+                return;
+            }
+            
+            const settle = pendingProofs.get(data.id);
+            if (settle) {
+                pendingProofs.delete(data.id);
+                settle(toProofResult(data));
+            } else if (data.success === false) {
+                // Timed-out job, or a line the worker could not attribute to any id
+                console.error(`   ❌ Python prover error for job ${data.id ?? 'unknown'}: ${data.error}`);
+            }
         });
         
         proc.stderr.on('data', (data) => {
@@ -153,80 +196,123 @@ async function callPythonProver(
                     console.log(`   [EZKL] ${line}`);
                 }
             });
-            stderr += data.toString();
+        });
+        
+        proc.on('error', (err) => {
+            console.error(`   ❌ Failed to spawn Python prover: ${err.message}`);
+            clearTimeout(startTimer);
+            if (proverProcess === proc) {
+                proverProcess = null;
+                proverReady = null;
+            }
+            resolve(false);
         });
         
         proc.on('close', (code) => {
-            if (code !== 0) {
-                resolve({
-                    success: false,
-                    error: `Python process exited with code ${code}: ${stderr}`
-                });
-                return;
+            // Fail everything still in flight; the next request restarts the worker
+            clearTimeout(startTimer);
+            if (proverProcess === proc) {
+                proverProcess = null;
+                proverReady = null;
             }
-            
-            try {
-                // Parse JSON output from Python
-                const result = JSON.parse(stdout.trim());
-                
-                if (!result.success) {
-                    resolve({
-                        success: false,
-                        error: result.error || 'Unknown Python error'
-                    });
-                    return;
-                }
-                
-                // Convert proof to format expected by verifier
-                const proofData = result.proof;
-                const proofBytes = new Uint8Array(proofData.proof);
-                const proofHex = '0x' + Buffer.from(proofBytes).toString('hex');
-                
-                // Convert instances from little-endian hex to bigint
-                const instances: bigint[] = proofData.instances[0].map((hex: string) => {
-                    const cleanHex = hex.startsWith('0x') ? hex.slice(2) : hex;
-                    const bytes = cleanHex.match(/.{2}/g)?.reverse().join('') || cleanHex;
-                    return BigInt('0x' + bytes);
-                });
-                
-                // Determine classification from instances
-                const classification = getClassificationFromInstances(instances);
-                
-                resolve({
-                    success: true,
-                    proof: proofData,
-                    proofHex,
-                    instances,
-                    outputHash: result.outputHash,
-                    classification,
-                    proofSizeBytes: result.proofSizeBytes,
-                    generationTimeMs: result.generationTimeMs,
-                    verified: result.verified
-                });
-                
-            } catch (parseError) {
-                resolve({
+            for (const [id, settle] of pendingProofs) {
+                pendingProofs.delete(id);
+                settle({
                     success: false,
-                    error: `Failed to parse Python output: ${parseError}`
+                    error: `Python prover exited with code ${code}`
                 });
             }
+            resolve(false);
         });
+    });
+    
+    return proverReady;
+}
+
+/**
+ * Convert a prover result line to the format expected by the verifier
+ */
+function toProofResult(result: any): EZKLProofResult {
+    if (!result.success) {
+        return {
+            success: false,
+            error: result.error || 'Unknown Python error'
+        };
+    }
+    
+    try {
+        // Proof arrives as raw bytes (base64), not the full proof JSON
+        const proofHex = '0x' + Buffer.from(result.proofB64, 'base64').toString('hex');
         
-        proc.on('error', (err) => {
-            resolve({
-                success: false,
-                error: `Failed to spawn Python process: ${err.message}`
-            });
+        // Convert instances from little-endian hex to bigint
+        const instances: bigint[] = result.instances[0].map((hex: string) => {
+            const cleanHex = hex.startsWith('0x') ? hex.slice(2) : hex;
+            const bytes = cleanHex.match(/.{2}/g)?.reverse().join('') || cleanHex;
+            return BigInt('0x' + bytes);
         });
         
-        // Timeout after 120 seconds (proof generation can take time)
-        setTimeout(() => {
-            proc.kill();
+        // Determine classification from instances
+        const classification = getClassificationFromInstances(instances);
+        
+        return {
+            success: true,
+            proofHex,
+            instances,
+            outputHash: result.outputHash,
+            classification,
+            proofSizeBytes: result.proofSizeBytes,
+            generationTimeMs: result.generationTimeMs,
+            verified: result.verified
+        };
+        
+    } catch (parseError) {
+        return {
+            success: false,
+            error: `Failed to parse Python output: ${parseError}`
+        };
+    }
+}
+
+/**
+ * Send a proof job to the persistent Python EZKL prover
+ */
+async function callPythonProver(
+    agentOutput: string,
+    jobId: string
+): Promise<EZKLProofResult> {
+    const ready = await startProver();
+    const proc = proverProcess;
+    
+    if (!ready || !proc) {
+        return {
+            success: false,
+            error: 'Python prover failed to start'
+        };
+    }
+    
+    return new Promise((resolve) => {
+        const id = nextProofId++;
+        
+        // Only this job times out; other proofs on the shared worker keep running
+        // and a late result for this id is dropped
+        const timer = setTimeout(() => {
+            pendingProofs.delete(id);
             resolve({
                 success: false,
-                error: 'Proof generation timed out after 120 seconds'
+                error: `Proof generation timed out after ${PROOF_TIMEOUT_MS / 1000} seconds`
             });
-        }, 120000);
+        }, PROOF_TIMEOUT_MS);
+        
+        pendingProofs.set(id, (result) => {
+            clearTimeout(timer);
+            resolve(result);
+        });
+        
+        proc.stdin?.write(JSON.stringify({
+            id,
+            output: agentOutput.slice(0, 10000), // Keep the input bound the same as the old CLI path
+            jobId
+        }) + '\n');
     });
 }
 
@@ -281,7 +367,6 @@ function loadStaticProofWithBinding(
         
         return {
             success: true,
-            proof: proofData,
             proofHex,
             instances,
             outputHash,
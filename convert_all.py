@@ -0,0 +1,196 @@
+"""
+XGBoost to ONNX Converter
+Loads each ensemble pkl once and writes every artifact the inference bridge can use:
+FP32 .onnx, int8 .int8.onnx (when the graph has dense ops) and pre-optimized .ort,
+plus the fused ensemble_model.onnx that runs both classifiers in one session
+"""
+import hashlib
+import json
+import os
+import pickle
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+
+warnings.filterwarnings('ignore')
+
+import onnx
+from onnx import compose, helper, TensorProto
+from onnxmltools import convert_xgboost
+from onnxmltools.convert.common.data_types import FloatTensorType
+from onnxruntime.quantization import quantize_dynamic, QuantType
+
+MODELS_DIR = Path(r'C:/Users/shaya/Desktop/Projects/Mosaic Protocol/ml-training/trained/models/ensemble')
+N_FEATURES = 68
+TARGET_OPSET = 12
+CONVERTER_VERSION = 'convert_all/1'
+QUANTIZABLE_OPS = ['MatMul', 'Gemm']
+
+# Weighted ensemble baked into the fused graph: 0.7 * recall + 0.3 * precision
+ENSEMBLE_MODELS = ('ensemble_recall_model', 'ensemble_precision_model')
+ENSEMBLE_WEIGHTS = (0.7, 0.3)
+FUSED_PATH = MODELS_DIR / 'ensemble_model.onnx'
+
+# Skip pkls whose bytes, opset and converter are unchanged since the last run
+MANIFEST_PATH = MODELS_DIR / '.convert_manifest.json'
+
+
+def load_manifest():
+    return json.loads(MANIFEST_PATH.read_text()) if MANIFEST_PATH.exists() else {}
+
+
+def save_manifest(manifest):
+    tmp_path = MANIFEST_PATH.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def scan_models(*suffixes):
+    """List MODELS_DIR entries by suffix in one directory read, keeping the OS-provided stat"""
+    with os.scandir(MODELS_DIR) as it:
+        return sorted((e for e in it if e.name.endswith(suffixes) and e.is_file()), key=lambda e: e.name)
+
+
+def convert_one(pkl_bytes):
+    """Convert a pickled XGBoost classifier to a validated ONNX proto"""
+    model = pickle.loads(pkl_bytes)
+    print(f'  Loaded {type(model).__name__} with {getattr(model, "n_features_in_", "?")} features')
+
+    initial_types = [('float_input', FloatTensorType([None, N_FEATURES]))]
+    onnx_model = convert_xgboost(
+        model,
+        name='xgboost_classifier',
+        initial_types=initial_types,
+        target_opset=TARGET_OPSET
+    )
+    onnx.checker.check_model(onnx_model)
+    return onnx_model
+
+
+def write_int8(onnx_model, int8_path):
+    """Write a dynamically quantized int8 variant from the in-memory proto"""
+    # Only dense ops quantize; TreeEnsembleClassifier thresholds must stay float
+    if not any(node.op_type in QUANTIZABLE_OPS for node in onnx_model.graph.node):
+        print('  Skipped int8: no MatMul/Gemm nodes to quantize')
+        return
+
+    quantize_dynamic(
+        onnx_model,
+        str(int8_path),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=QUANTIZABLE_OPS
+    )
+    print(f'  Saved: {int8_path.name} ({int8_path.stat().st_size / 1024:.1f} KB)')
+
+
+def write_ort(onnx_path):
+    """Pre-optimize to ORT format so the inference bridge skips graph optimization at startup"""
+    subprocess.run(
+        [sys.executable, '-m', 'onnxruntime.tools.convert_onnx_models_to_ort',
+         str(onnx_path), '--optimization_style', 'Fixed'],
+        check=True, capture_output=True
+    )
+    ort_path = onnx_path.with_suffix('.ort')
+    print(f'  Saved: {ort_path.name} ({ort_path.stat().st_size / 1024:.1f} KB)')
+
+
+def fuse_ensemble(recall_model, precision_model):
+    """
+    Combine both classifiers into one graph over a shared input.
+    Outputs P(vulnerable) per model plus their weighted blend, all shaped [N].
+    """
+    recall = compose.add_prefix(recall_model, 'recall_', rename_inputs=False)
+    precision = compose.add_prefix(precision_model, 'precision_', rename_inputs=False)
+    recall_weight, precision_weight = ENSEMBLE_WEIGHTS
+
+    nodes = [
+        *recall.graph.node,
+        *precision.graph.node,
+        helper.make_node('Gather', ['recall_probabilities', 'positive_class'], ['recall_score'], axis=1),
+        helper.make_node('Gather', ['precision_probabilities', 'positive_class'], ['precision_score'], axis=1),
+        helper.make_node('Mul', ['recall_score', 'recall_weight'], ['recall_weighted']),
+        helper.make_node('Mul', ['precision_score', 'precision_weight'], ['precision_weighted']),
+        helper.make_node('Add', ['recall_weighted', 'precision_weighted'], ['probability']),
+    ]
+    initializers = [
+        *recall.graph.initializer,
+        *precision.graph.initializer,
+        helper.make_tensor('positive_class', TensorProto.INT64, [], [1]),
+        helper.make_tensor('recall_weight', TensorProto.FLOAT, [], [recall_weight]),
+        helper.make_tensor('precision_weight', TensorProto.FLOAT, [], [precision_weight]),
+    ]
+    outputs = [
+        helper.make_tensor_value_info(name, TensorProto.FLOAT, [None])
+        for name in ('probability', 'recall_score', 'precision_score')
+    ]
+    graph = helper.make_graph(nodes, 'xgboost_ensemble', [recall.graph.input[0]], outputs, initializers)
+
+    # The tree exports only import ai.onnx.ml; Gather/Mul/Add need the default domain too
+    opsets = {op.domain: op.version for op in (*recall.opset_import, *precision.opset_import)}
+    opsets.setdefault('', TARGET_OPSET)
+    fused = helper.make_model(graph, opset_imports=[helper.make_opsetid(d, v) for d, v in opsets.items()])
+    fused.ir_version = recall.ir_version
+    onnx.checker.check_model(fused)
+    return fused
+
+
+def main():
+    print('='*60)
+    print('XGBoost to ONNX Converter')
+    print('='*60)
+
+    manifest = load_manifest()
+    protos = {}
+
+    for entry in scan_models('.pkl'):
+        pkl_file = Path(entry.path)
+        print(f'\n{pkl_file.name}:')
+
+        pkl_bytes = pkl_file.read_bytes()
+        cache_key = [hashlib.sha256(pkl_bytes).hexdigest(), TARGET_OPSET, CONVERTER_VERSION]
+        onnx_path = pkl_file.with_suffix('.onnx')
+        if onnx_path.exists() and manifest.get(pkl_file.name) == cache_key:
+            print('  Unchanged, skipping')
+            continue
+
+        try:
+            onnx_model = convert_one(pkl_bytes)
+            protos[pkl_file.stem] = onnx_model
+
+            onnx_path.write_bytes(onnx_model.SerializeToString())
+            print(f'  Saved: {onnx_path.name} ({onnx_path.stat().st_size / 1024:.1f} KB)')
+
+            write_int8(onnx_model, onnx_path.with_suffix('.int8.onnx'))
+            write_ort(onnx_path)
+
+            manifest[pkl_file.name] = cache_key
+            save_manifest(manifest)
+
+        except Exception as e:
+            print(f'  ERROR: {e}')
+
+    # Rebuild the fused graph whenever either classifier changed
+    if protos or not FUSED_PATH.exists():
+        print(f'\n{FUSED_PATH.name}:')
+        try:
+            recall_model, precision_model = (
+                protos.get(name) or onnx.load(str(MODELS_DIR / f'{name}.onnx'))
+                for name in ENSEMBLE_MODELS
+            )
+            fused = fuse_ensemble(recall_model, precision_model)
+            FUSED_PATH.write_bytes(fused.SerializeToString())
+            print(f'  Saved: {FUSED_PATH.name} ({FUSED_PATH.stat().st_size / 1024:.1f} KB)')
+            write_ort(FUSED_PATH)
+        except Exception as e:
+            print(f'  ERROR: {e}')
+
+    print('\n' + '='*60)
+    print('Output files:')
+    for entry in scan_models('.onnx', '.ort'):
+        print(f'  {entry.name}: {entry.stat().st_size / 1024:.1f} KB')
+    print('='*60)
+
+
+if __name__ == '__main__':
+    main()
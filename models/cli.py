@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+EZKL developer commands for the models directory
+Runs one or more steps in a single process so ezkl, numpy and the paths below
+are only loaded once:
+
+    python cli.py srs proof verifier
+    python cli.py mock
+"""
+import argparse
+import asyncio
+import os
+import sys
+import orjson
+from witness_cache import cached_gen_witness
+from ezkl_srs import settings_srs_path, srs_path_for, file_stamp, files_hash, sig_matches, write_sig
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_PATH = os.path.join(SCRIPT_DIR, "input.json")
+COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
+WITNESS_PATH = os.path.join(SCRIPT_DIR, "witness.json")
+SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
+PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
+VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
+PROOF_PATH = os.path.join(SCRIPT_DIR, "proof.json")
+VERIFIER_SOL_PATH = os.path.join(SCRIPT_DIR, "Verifier.sol")
+
+# ezkl (and numpy, for proof) is imported inside each command (cached by Python
+# after the first one), so mock can reject missing inputs without loading it
+
+
+def _load(path):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+async def cmd_srs():
+    """Download proper SRS file for EZKL"""
+    import ezkl
+    
+    print("Downloading SRS (structured reference string)...")
+    print("This may take a minute...")
+    
+    # Get logrows from settings
+    settings = _load(SETTINGS_PATH)
+    
+    logrows = settings.get("run_args", {}).get("logrows", 17)
+    print(f"Using logrows: {logrows}")
+    
+    srs_path = srs_path_for(logrows)
+    await ezkl.get_srs(srs_path, logrows)
+    
+    size = os.path.getsize(srs_path)
+    print(f"✅ SRS downloaded: {size / 1024 / 1024:.2f} MB")
+
+
+async def cmd_proof():
+    """Generate witness and proof using existing keys"""
+    import ezkl
+    import numpy as np
+    
+    print("=" * 60)
+    print("   Generating Real ZK Proof")
+    print("=" * 60)
+    
+    srs_path = settings_srs_path(SETTINGS_PATH)
+    
+    # Create proper input file
+    print("\n[1/4] Creating input data...")
+    rng = np.random.default_rng(42)
+    input_data = {"input_data": [rng.standard_normal(16, dtype=np.float32)]}
+    with open(INPUT_PATH, 'wb') as f:
+        f.write(orjson.dumps(input_data, option=orjson.OPT_SERIALIZE_NUMPY))
+    print(f"   Input shape: 16 values")
+    print(f"   First 3 values: {input_data['input_data'][0][:3]}")
+    
+    # Generate witness
+    print("\n[2/4] Generating witness...")
+    if cached_gen_witness(INPUT_PATH, COMPILED_PATH, WITNESS_PATH):
+        print(f"   ♻️  Witness reused from cache")
+    else:
+        print(f"   ✅ Witness generated")
+    
+    # Read witness to show outputs
+    witness = _load(WITNESS_PATH)
+    print(f"   Witness has {len(witness.get('inputs', []))} inputs")
+    print(f"   Witness has {len(witness.get('outputs', []))} outputs")
+    
+    # Generate proof
+    print("\n[3/4] Generating ZK proof (this may take a minute)...")
+    res = ezkl.prove(
+        WITNESS_PATH,
+        COMPILED_PATH,
+        PK_PATH,
+        PROOF_PATH,
+        srs_path
+    )
+    print(f"   ✅ Proof generated: {res}")
+    print(f"   📦 Proof size: {os.path.getsize(PROOF_PATH) / 1024:.2f} KB")
+    
+    # Verify proof
+    print("\n[4/4] Verifying proof...")
+    res = ezkl.verify(PROOF_PATH, SETTINGS_PATH, VK_PATH, srs_path)
+    print(f"   ✅ Proof verified: {res}")
+    
+    print("\n" + "=" * 60)
+    print("   ✅ SUCCESS! Real ZK proof generated and verified!")
+    print("=" * 60)
+    
+    # Show proof contents
+    proof = _load(PROOF_PATH)
+    print(f"\nProof structure:")
+    for key, val in proof.items():
+        if isinstance(val, str):
+            print(f"  - {key}: {val[:50]}..." if len(val) > 50 else f"  - {key}: {val}")
+        elif isinstance(val, list):
+            print(f"  - {key}: list of {len(val)} items")
+        else:
+            print(f"  - {key}: {type(val).__name__}")
+
+
+async def cmd_verifier():
+    """Generate Solidity verifier contract from EZKL setup"""
+    import ezkl
+
+    print("=" * 60)
+    print("Generating Solidity Verifier Contract")
+    print("=" * 60)
+
+    srs_path = settings_srs_path(SETTINGS_PATH)
+
+    print(f"\nInputs:")
+    print(f"  VK: {VK_PATH}")
+    print(f"  Settings: {SETTINGS_PATH}")
+    print(f"  SRS: {srs_path}")
+
+    print(f"\nOutputs:")
+    print(f"  Verifier.sol: {VERIFIER_SOL_PATH}")
+
+    # Verifier.sol is a pure function of the VK and settings; its .sig records their hash
+    verifier_sig = files_hash(VK_PATH, SETTINGS_PATH)
+    if sig_matches(VERIFIER_SOL_PATH, verifier_sig):
+        print(f"\n♻️  Verifier.sol is up to date with vk.key and settings.json")
+        print("\n" + "=" * 60)
+        return True
+
+    try:
+        before = file_stamp(VERIFIER_SOL_PATH)
+        # Generate the EVM verifier contract
+        res = await ezkl.create_evm_verifier(
+            VK_PATH,
+            SETTINGS_PATH,
+            VERIFIER_SOL_PATH,
+            srs_path
+        )
+        print(f"\n✅ Verifier generated: {res}")
+        
+        # Only record the hash once a fresh Verifier.sol is actually on disk
+        after = file_stamp(VERIFIER_SOL_PATH)
+        if after is not None and after != before:
+            write_sig(VERIFIER_SOL_PATH, verifier_sig)
+    
+        if after is not None:
+            size = after[1]
+            print(f"📦 Contract size: {size:,} bytes ({size/1024:.1f} KB)")
+            
+            # Show first few lines of the contract
+            with open(VERIFIER_SOL_PATH, 'r') as f:
+                lines = f.readlines()[:20]
+            print(f"\nFirst 20 lines of Verifier.sol:")
+            print("-" * 40)
+            for line in lines:
+                print(line.rstrip())
+            print("-" * 40)
+        else:
+            print("❌ Verifier.sol was not created")
+            
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+    print("\n" + "=" * 60)
+
+
+def cmd_mock():
+    """EZKL Mock Test - Quick circuit verification"""
+    print("Running EZKL mock prover...")
+    print(f"Compiled: {COMPILED_PATH}")
+    print(f"Witness: {WITNESS_PATH}")
+
+    # Fail fast on missing inputs before paying for the ezkl import
+    missing = [p for p in (COMPILED_PATH, WITNESS_PATH) if not os.path.exists(p)]
+    if missing:
+        print(f"Mock failed: missing {', '.join(missing)}")
+        return False
+
+    import ezkl
+
+    try:
+        res = ezkl.mock(WITNESS_PATH, COMPILED_PATH)
+        print(f"Mock result: {res}")
+        if res:
+            print("SUCCESS: Circuit constraints satisfied!")
+        else:
+            print("FAILED: Circuit constraints NOT satisfied")
+        return bool(res)
+    except Exception as e:
+        print(f"Mock failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+COMMANDS = {
+    "srs": cmd_srs,
+    "proof": cmd_proof,
+    "verifier": cmd_verifier,
+    "mock": cmd_mock,
+}
+
+
+async def run(commands):
+    """Run commands in order, stopping at the first one that reports failure"""
+    for name in commands:
+        result = COMMANDS[name]()
+        if asyncio.iscoroutine(result):
+            result = await result
+        if result is False:
+            return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EZKL developer commands")
+    parser.add_argument("commands", nargs="+", choices=list(COMMANDS), help="steps to run, in order")
+    args = parser.parse_args(argv)
+    if not asyncio.run(run(args.commands)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,13 @@
 import json
 import os
 import ezkl
+from ezkl_srs import settings_srs_path, map_warm
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROOF_PATH = os.path.join(SCRIPT_DIR, "proof.json")
 SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
 VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
-SRS_PATH = os.path.join(SCRIPT_DIR, "kzg.srs")
+SRS_PATH = settings_srs_path(SETTINGS_PATH)
 COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
 WITNESS_PATH = os.path.join(SCRIPT_DIR, "witness.json")
 PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
@@ -48,6 +49,9 @@ for key in proof.keys():
     else:
         print(f"  {key}: {type(val).__name__}")
 
+# Warm the large artifacts so mock/verify timings are not dominated by cold reads
+mappings = [map_warm(path) for path in (SRS_PATH, VK_PATH, PK_PATH) if os.path.exists(path)]
+
 # Try mock again to confirm
 print("\nMock test:")
 try:
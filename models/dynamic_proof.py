@@ -3,181 +3,328 @@
 Dynamic Proof Generator for Mosaic Protocol
 Generates FRESH EZKL proofs bound to actual agent outputs.
 Each proof has unique instances derived from the output hash.
+
+Run with --serve to keep one worker alive and prove JSONL jobs from stdin.
 """
 import ezkl
-import json
+import orjson
 import hashlib
+import io
+import multiprocessing
 import numpy as np
 import os
+import re
+import secrets
 import sys
 import asyncio
+import base64
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from ezkl_srs import settings_srs_path, map_warm
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
 SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
-SRS_PATH = os.path.join(SCRIPT_DIR, "kzg_17.srs")
+SRS_PATH = settings_srs_path(SETTINGS_PATH)
 PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
 VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
 
+# Ids the backend assigns are integers: {"id": 3, "output": ..., "jobId": ...}
+JOB_ID_RE = re.compile(r'"id"\s*:\s*(-?\d+)')
+
+# Per-proof scratch files live on tmpfs where available so they never hit disk
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
 # Use unique filenames for each proof to avoid conflicts
 def get_temp_paths(output_hash: str):
     """Get unique temp file paths for this proof generation"""
-    short_hash = output_hash[:8]
+    # Random suffix keeps concurrent proofs of the same output apart
+    short_hash = f"{output_hash[:8]}_{secrets.token_hex(4)}"
     return {
-        "input": os.path.join(SCRIPT_DIR, f"input_{short_hash}.json"),
-        "witness": os.path.join(SCRIPT_DIR, f"witness_{short_hash}.json"),
-        "proof": os.path.join(SCRIPT_DIR, f"proof_{short_hash}.json")
+        "input": os.path.join(TEMP_DIR, f"input_{short_hash}.json"),
+        "witness": os.path.join(TEMP_DIR, f"witness_{short_hash}.json"),
+        "proof": os.path.join(TEMP_DIR, f"proof_{short_hash}.json")
     }
 
-def output_to_embeddings(output_text: str, output_hash: str) -> list:
+def load_result(res, path: str) -> dict:
+    """Use the object ezkl returned, reading its output file only if none came back"""
+    if isinstance(res, dict):
+        return res
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+# Sentiment indicators
+BULLISH_WORDS = ['growth', 'increase', 'profit', 'bullish', 'rise', 'gain', 'positive']
+BEARISH_WORDS = ['decline', 'decrease', 'loss', 'bearish', 'fall', 'drop', 'negative']
+
+def output_to_embeddings(output_text: str, output_digest: bytes) -> list:
     """
     Convert agent output to 16-dimensional embedding.
     Uses output hash to ensure deterministic but unique inputs per output.
     """
     # Hash the output to get deterministic seed
-    hash_bytes = bytes.fromhex(output_hash)
-    seed = int.from_bytes(hash_bytes[:4], 'big')
-    np.random.seed(seed)
+    seed = int.from_bytes(output_digest[:4], 'big')
     
     # Generate base embeddings from hash
-    embeddings = np.random.randn(16).tolist()
+    embeddings = np.random.default_rng(seed).standard_normal(16).tolist()
     
     # Add semantic features from actual text
     text_lower = output_text.lower()
     
-    # Sentiment indicators
-    bullish_words = ['growth', 'increase', 'profit', 'bullish', 'rise', 'gain', 'positive']
-    bearish_words = ['decline', 'decrease', 'loss', 'bearish', 'fall', 'drop', 'negative']
-    
+    # Each indicator counts once, however often it appears
     sentiment = 0.0
-    for word in bullish_words:
+    for word in BULLISH_WORDS:
         if word in text_lower:
             sentiment += 0.3
-    for word in bearish_words:
+    for word in BEARISH_WORDS:
         if word in text_lower:
             sentiment -= 0.3
     
     # Modify last few embeddings based on content
-    embeddings[14] = np.tanh(sentiment)
+    embeddings[14] = float(np.tanh(sentiment))
     embeddings[15] = 1.0 if sentiment > 0 else (-1.0 if sentiment < 0 else 0.0)
     
     return embeddings
 
-async def generate_fresh_proof(output_text: str, job_id: str = None) -> dict:
+def init_pool_worker(rayon_threads: int):
+    """Cap ezkl's Rayon pool in each worker so concurrent proofs share the cores"""
+    # Rayon reads this when its global pool is first used, i.e. on the first proof
+    os.environ["RAYON_NUM_THREADS"] = str(rayon_threads)
+
+class ProofWorker:
     """
-    Generate a FRESH ZK proof for the given agent output.
-    Returns proof data with output-bound instances.
+    Long-lived prover that serves many proofs from one process.
+    Witness, prove and verify run in a small process pool so several proofs
+    progress in parallel instead of blocking the event loop. Each pool process
+    reads pk.key and the SRS itself; the parent only warms the OS page cache
+    so those reads do not go to disk.
     """
-    start_time = time.time()
-    
-    # Compute output hash
-    output_hash = hashlib.sha256(output_text.encode()).hexdigest()
-    paths = get_temp_paths(output_hash)
     
-    print(f"\n{'='*60}", file=sys.stderr)
-    print(f"🔐 GENERATING FRESH EZKL PROOF", file=sys.stderr)
-    print(f"{'='*60}", file=sys.stderr)
-    print(f"   Job ID: {job_id or 'N/A'}", file=sys.stderr)
-    print(f"   Output hash: {output_hash[:16]}...", file=sys.stderr)
-    print(f"   Output length: {len(output_text)} chars", file=sys.stderr)
+    def __init__(self, max_workers: int = None):
+        cpus = os.cpu_count() or 2
+        self.workers = max_workers or max(1, min(4, cpus // 2))
+        self.rayon_threads = max(1, cpus // self.workers)
+        self.pool = self.new_pool()
+        self.mappings = [map_warm(path) for path in (PK_PATH, VK_PATH, SRS_PATH) if os.path.exists(path)]
     
-    try:
-        # Step 1: Create input from output
-        print(f"\n[1/3] Creating output-bound input...", file=sys.stderr)
-        embeddings = output_to_embeddings(output_text, output_hash)
-        input_data = {"input_data": [embeddings]}
-        
-        with open(paths["input"], 'w') as f:
-            json.dump(input_data, f)
-        
-        print(f"   ✅ Input embeddings: {embeddings[:3]}...", file=sys.stderr)
-        
-        # Step 2: Generate witness
-        print(f"\n[2/3] Generating witness from output...", file=sys.stderr)
-        res = ezkl.gen_witness(paths["input"], COMPILED_PATH, paths["witness"])
-        
-        with open(paths["witness"], 'r') as f:
-            witness = json.load(f)
-        
-        print(f"   ✅ Witness inputs: {len(witness.get('inputs', []))}", file=sys.stderr)
-        print(f"   ✅ Witness outputs: {len(witness.get('outputs', []))}", file=sys.stderr)
-        
-        # Step 3: Generate proof
-        print(f"\n[3/3] Generating ZK proof (this takes ~10-30 seconds)...", file=sys.stderr)
-        res = ezkl.prove(
-            paths["witness"],
-            COMPILED_PATH,
-            PK_PATH,
-            paths["proof"],
-            SRS_PATH
+    def new_pool(self) -> ProcessPoolExecutor:
+        # Never fork: a forked child closes the inherited sys.stdin, whose lock the
+        # --serve reader thread holds while blocked in readline, and hangs there
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(method),
+            initializer=init_pool_worker,
+            initargs=(self.rayon_threads,)
         )
+    
+    def replace_broken_pool(self, broken: ProcessPoolExecutor):
+        """
+        A pool process that died (e.g. OOM-killed in prove) breaks the whole pool.
+        Swap in a fresh one once; concurrent jobs that saw the same pool fail skip this.
+        """
+        if self.pool is broken:
+            print("   ⚠️ Proof pool broken, starting a new one", file=sys.stderr)
+            self.pool = self.new_pool()
+            broken.shutdown(wait=False, cancel_futures=True)
+    
+    async def prove(self, output_text: str, job_id: str = None) -> dict:
+        """
+        Generate a FRESH ZK proof for the given agent output.
+        Returns proof data with output-bound instances.
+        """
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        pool = self.pool
         
-        # Load the generated proof
-        with open(paths["proof"], 'r') as f:
-            proof_data = json.load(f)
-        
-        elapsed = time.time() - start_time
-        proof_size = os.path.getsize(paths["proof"])
-        
-        print(f"\n   🎉 FRESH PROOF GENERATED!", file=sys.stderr)
-        print(f"   ⏱️  Time: {elapsed:.2f}s", file=sys.stderr)
-        print(f"   📦 Size: {proof_size} bytes", file=sys.stderr)
-        print(f"   📊 Instances: {len(proof_data.get('instances', [[]]))} groups", file=sys.stderr)
-        
-        # Verify locally
-        print(f"\n   🔍 Verifying proof locally...", file=sys.stderr)
-        verify_res = ezkl.verify(paths["proof"], SETTINGS_PATH, VK_PATH, SRS_PATH)
-        print(f"   ✅ Local verification: {'PASSED' if verify_res else 'FAILED'}", file=sys.stderr)
-        
-        # Cleanup temp files
-        for path in paths.values():
-            if os.path.exists(path):
-                os.remove(path)
+        # Collect progress lines and write them to stderr once per proof
+        log = io.StringIO()
         
-        # Return proof with metadata
-        result = {
-            "success": True,
-            "proof": proof_data,
-            "outputHash": output_hash,
-            "proofSizeBytes": proof_size,
-            "generationTimeMs": int(elapsed * 1000),
-            "instanceCount": len(proof_data.get("instances", [[]])[0]) if proof_data.get("instances") else 0,
-            "verified": verify_res
-        }
+        # Compute output hash once - SHA-256 because outputHash is surfaced in the proof metadata
+        output_digest = hashlib.sha256(output_text.encode('utf-8')).digest()
+        output_hash = output_digest.hex()
+        paths = get_temp_paths(output_hash)
         
-        print(f"\n{'='*60}", file=sys.stderr)
+        print(f"\n{'='*60}", file=log)
+        print(f"🔐 GENERATING FRESH EZKL PROOF", file=log)
+        print(f"{'='*60}", file=log)
+        print(f"   Job ID: {job_id or 'N/A'}", file=log)
+        print(f"   Output hash: {output_hash[:16]}...", file=log)
+        print(f"   Output length: {len(output_text)} chars", file=log)
         
-        return result
+        try:
+            # Step 1: Create input from output
+            print(f"\n[1/3] Creating output-bound input...", file=log)
+            embeddings = output_to_embeddings(output_text, output_digest)
+            input_data = {"input_data": [embeddings]}
+            
+            with open(paths["input"], 'wb') as f:
+                f.write(orjson.dumps(input_data))
+            
+            print(f"   ✅ Input embeddings: {embeddings[:3]}...", file=log)
+            
+            # Step 2: Generate witness
+            print(f"\n[2/3] Generating witness from output...", file=log)
+            res = await loop.run_in_executor(
+                pool, ezkl.gen_witness, paths["input"], COMPILED_PATH, paths["witness"]
+            )
+            witness = load_result(res, paths["witness"])
+            
+            print(f"   ✅ Witness inputs: {len(witness.get('inputs', []))}", file=log)
+            print(f"   ✅ Witness outputs: {len(witness.get('outputs', []))}", file=log)
+            
+            # Step 3: Generate proof
+            print(f"\n[3/3] Generating ZK proof (this takes ~10-30 seconds)...", file=log)
+            res = await loop.run_in_executor(
+                pool,
+                ezkl.prove,
+                paths["witness"],
+                COMPILED_PATH,
+                PK_PATH,
+                paths["proof"],
+                SRS_PATH
+            )
+            proof_data = load_result(res, paths["proof"])
+            
+            # Only the raw proof bytes and the public instances leave this process
+            proof_bytes = bytes(proof_data["proof"])
+            instances = proof_data.get("instances", [])
+            
+            elapsed = time.time() - start_time
+            
+            print(f"\n   🎉 FRESH PROOF GENERATED!", file=log)
+            print(f"   ⏱️  Time: {elapsed:.2f}s", file=log)
+            print(f"   📦 Size: {len(proof_bytes)} bytes", file=log)
+            print(f"   📊 Instances: {len(instances)} groups", file=log)
+            
+            # Verify locally
+            print(f"\n   🔍 Verifying proof locally...", file=log)
+            verify_res = await loop.run_in_executor(
+                pool, ezkl.verify, paths["proof"], SETTINGS_PATH, VK_PATH, SRS_PATH
+            )
+            print(f"   ✅ Local verification: {'PASSED' if verify_res else 'FAILED'}", file=log)
+            
+            # Cleanup temp files
+            for path in paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            
+            # Return proof with metadata
+            result = {
+                "success": True,
+                "proofB64": base64.b64encode(proof_bytes).decode(),
+                "instances": instances,
+                "outputHash": output_hash,
+                "proofSizeBytes": len(proof_bytes),
+                "generationTimeMs": int(elapsed * 1000),
+                "instanceCount": len(instances[0]) if instances else 0,
+                "verified": verify_res
+            }
+            
+            print(f"\n{'='*60}", file=log)
+            
+            return result
+            
+        except Exception as e:
+            print(f"\n   ❌ Error: {str(e)}", file=log)
+            if isinstance(e, BrokenProcessPool):
+                self.replace_broken_pool(pool)
+            
+            # Cleanup on error
+            for path in paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            
+            return {
+                "success": False,
+                "error": str(e),
+                "outputHash": output_hash
+            }
         
+        finally:
+            sys.stderr.write(log.getvalue())
+            sys.stderr.flush()
+
+
+def emit(obj: dict):
+    """Write one JSON line to stdout as raw bytes"""
+    sys.stdout.buffer.write(orjson.dumps(obj) + b"\n")
+    sys.stdout.buffer.flush()
+
+def salvage_id(line: str):
+    """Best-effort job id from a line that is not valid JSON, so the caller can still match the error"""
+    match = JOB_ID_RE.search(line)
+    return int(match.group(1)) if match else None
+
+async def handle_job(worker: ProofWorker, job):
+    """Prove one job and write its result, tagged with the job's id"""
+    # Every job gets exactly one reply, or the caller waits out its full timeout
+    job_id = job.get("id") if isinstance(job, dict) else None
+    try:
+        if not isinstance(job, dict):
+            raise ValueError("Job must be a JSON object")
+        output = job.get("output", "")
+        if not isinstance(output, str):
+            raise ValueError("Job output must be a string")
+        result = await worker.prove(output, job.get("jobId"))
     except Exception as e:
-        print(f"\n   ❌ Error: {str(e)}", file=sys.stderr)
+        result = {"success": False, "error": str(e)}
+    result["id"] = job_id
+    emit(result)
+
+async def serve(worker: ProofWorker):
+    """
+    Persistent mode - one JSON job per stdin line, one JSON result per stdout line.
+    Jobs run concurrently, so results can come back out of order; match them by id.
+    """
+    loop = asyncio.get_running_loop()
+    jobs = set()
+    emit({"status": "ready"})
+    
+    while True:
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
         
-        # Cleanup on error
-        for path in paths.values():
-            if os.path.exists(path):
-                os.remove(path)
+        try:
+            job = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            emit({"success": False, "error": f"Invalid JSON: {e}", "id": salvage_id(line)})
+            continue
         
-        return {
-            "success": False,
-            "error": str(e),
-            "outputHash": output_hash
-        }
+        task = asyncio.create_task(handle_job(worker, job))
+        jobs.add(task)
+        task.add_done_callback(jobs.discard)
+    
+    # Finish in-flight proofs once stdin closes
+    if jobs:
+        await asyncio.gather(*jobs)
 
 def main():
     """CLI interface for generating proofs"""
     if len(sys.argv) < 2:
         print("Usage: python dynamic_proof.py <output_text> [job_id]", file=sys.stderr)
+        print("       python dynamic_proof.py --serve", file=sys.stderr)
         print("  Output text should be the agent's actual output", file=sys.stderr)
+        print("  --serve reads {\"id\", \"output\", \"jobId\"} JSON lines from stdin", file=sys.stderr)
         sys.exit(1)
     
+    if sys.argv[1] == "--serve":
+        asyncio.run(serve(ProofWorker()))
+        return
+    
     output_text = sys.argv[1]
     job_id = sys.argv[2] if len(sys.argv) > 2 else None
     
-    result = asyncio.run(generate_fresh_proof(output_text, job_id))
+    result = asyncio.run(ProofWorker().prove(output_text, job_id))
     
     # Output JSON result to stdout for Node.js to parse
-    print(json.dumps(result))
+    emit(result)
 
 if __name__ == "__main__":
     main()
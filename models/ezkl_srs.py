@@ -0,0 +1,132 @@
+"""
+Helpers shared by the EZKL scripts
+SRS files are keyed by logrows (kzg_{logrows}.srs), so every tool proves and
+verifies against the same SRS the keys were generated with. Derived files carry
+a .sig sidecar in one format, whichever script wrote them.
+"""
+import hashlib
+import mmap
+import os
+import orjson
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
+COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
+PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
+VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
+# Circuit hash and SRS the current pk.key/vk.key were generated from
+KEYS_MANIFEST_PATH = os.path.join(SCRIPT_DIR, "keys_manifest.json")
+DEFAULT_LOGROWS = 17
+
+
+def srs_path_for(logrows):
+    """SRS file for circuits of the given size"""
+    return os.path.join(SCRIPT_DIR, f"kzg_{logrows}.srs")
+
+
+def settings_logrows(settings_path=SETTINGS_PATH):
+    """logrows from the circuit settings, or the default when there are none yet"""
+    if not os.path.exists(settings_path):
+        return DEFAULT_LOGROWS
+    with open(settings_path, 'rb') as f:
+        return orjson.loads(f.read()).get("run_args", {}).get("logrows", DEFAULT_LOGROWS)
+
+
+def settings_srs_path(settings_path=SETTINGS_PATH):
+    """SRS file matching the current settings.json"""
+    return srs_path_for(settings_logrows(settings_path))
+
+
+def map_warm(path):
+    """
+    Map a key/SRS file read-only and pull it into the page cache ahead of ezkl's reads.
+    Keep the returned mapping alive for as long as the file should stay cached.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_WILLNEED'):
+        # Kernel reads ahead in the background; MAP_POPULATE would block until every page is in
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+        mm.madvise(mmap.MADV_WILLNEED)
+    else:
+        # Windows has no madvise - touch every page once instead
+        for offset in range(0, len(mm), mmap.PAGESIZE):
+            mm[offset]
+    return mm
+
+
+def write_file(path, data):
+    """Write a small file straight to its descriptor, bypassing Python's buffered I/O"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def file_stamp(path):
+    """(mtime_ns, size) of path, None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def files_hash(*paths):
+    """Combined sha256 over the contents of each file"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def circuit_hash():
+    """Hash of the compiled circuit and its settings (which include logrows), None if either is missing"""
+    if not (os.path.exists(COMPILED_PATH) and os.path.exists(SETTINGS_PATH)):
+        return None
+    return files_hash(COMPILED_PATH, SETTINGS_PATH)
+
+
+def keys_cached(current_hash, srs_path):
+    """Check that pk.key/vk.key exist and were generated for this exact circuit and SRS"""
+    if current_hash is None or not os.path.exists(KEYS_MANIFEST_PATH):
+        return False
+    if not all(os.path.exists(p) and os.path.getsize(p) > 0 for p in (PK_PATH, VK_PATH)):
+        return False
+    with open(KEYS_MANIFEST_PATH, 'rb') as f:
+        manifest = orjson.loads(f.read())
+    return manifest.get('circuit_hash') == current_hash and manifest.get('srs') == os.path.basename(srs_path)
+
+
+def write_keys_manifest(current_hash, srs_path):
+    """Record the circuit and SRS that pk.key/vk.key were just generated from"""
+    write_file(KEYS_MANIFEST_PATH, orjson.dumps({'circuit_hash': current_hash, 'srs': os.path.basename(srs_path)}))
+
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def sig_matches(path, sig):
+    """
+    Check that path's .sig sidecar records the given recipe and the hash of the
+    bytes on disk, so a file rewritten by another script is not mistaken for ours
+    """
+    sig_path = os.fspath(path) + ".sig"
+    if not (os.path.exists(path) and os.path.exists(sig_path)):
+        return False
+    with open(sig_path, 'r') as f:
+        recorded = f.read().split("\n")
+    if len(recorded) != 2 or recorded[0] != sig:
+        return False
+    return _file_sha256(path) == recorded[1]
+
+
+def write_sig(path, sig):
+    """Record the recipe path was written from and the hash of what was written"""
+    write_file(os.fspath(path) + ".sig", f"{sig}\n{_file_sha256(path)}".encode())
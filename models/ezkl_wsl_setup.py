@@ -8,6 +8,7 @@ import os
 import json
 import asyncio
 import numpy as np
+from ezkl_srs import settings_srs_path, srs_path_for
 
 # Paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -17,7 +18,6 @@ SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
 CALIBRATION_PATH = os.path.join(SCRIPT_DIR, "calibration.json")
 COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
 WITNESS_PATH = os.path.join(SCRIPT_DIR, "witness.json")
-SRS_PATH = os.path.join(SCRIPT_DIR, "kzg.srs")
 PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
 VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
 PROOF_PATH = os.path.join(SCRIPT_DIR, "proof.json")
@@ -111,6 +111,7 @@ async def setup_ezkl():
         settings = json.load(f)
     logrows = settings.get('run_args', {}).get('logrows', 17)
     print(f"   Using logrows: {logrows}")
+    srs_path = srs_path_for(logrows)
     
     # Compile circuit
     print("\n[5/7] Compiling circuit...")
@@ -119,13 +120,13 @@ async def setup_ezkl():
     
     # Get SRS using EZKL's built-in function
     print("\n[6/7] Getting SRS (structured reference string)...")
-    res = await ezkl.get_srs(SRS_PATH, logrows)
+    res = await ezkl.get_srs(srs_path, logrows)
     print(f"   ✅ SRS obtained: {res}")
-    print(f"   📦 SRS size: {os.path.getsize(SRS_PATH) / 1024 / 1024:.2f} MB")
+    print(f"   📦 SRS size: {os.path.getsize(srs_path) / 1024 / 1024:.2f} MB")
     
     # Setup (generate proving and verification keys)
     print("\n[7/7] Generating proving and verification keys...")
-    res = ezkl.setup(COMPILED_PATH, VK_PATH, PK_PATH, SRS_PATH)
+    res = ezkl.setup(COMPILED_PATH, VK_PATH, PK_PATH, srs_path)
     print(f"   ✅ Keys generated: {res}")
     print(f"   📦 PK size: {os.path.getsize(PK_PATH) / 1024 / 1024:.2f} MB")
     print(f"   📦 VK size: {os.path.getsize(VK_PATH) / 1024:.2f} KB")
@@ -157,14 +158,14 @@ async def generate_proof():
         PK_PATH,
         PROOF_PATH,
         "single",
-        SRS_PATH
+        settings_srs_path(SETTINGS_PATH)
     )
     print(f"   ✅ Proof generated: {res}")
     print(f"   📦 Proof size: {os.path.getsize(PROOF_PATH) / 1024:.2f} KB")
     
     # Verify proof
     print("   Verifying proof...")
-    res = await ezkl.verify(PROOF_PATH, SETTINGS_PATH, VK_PATH, SRS_PATH)
+    res = await ezkl.verify(PROOF_PATH, SETTINGS_PATH, VK_PATH, settings_srs_path(SETTINGS_PATH))
     print(f"   ✅ Proof verified: {res}")
     
     return True
@@ -180,7 +181,7 @@ async def generate_solidity_verifier():
         VK_PATH,
         SETTINGS_PATH,
         VERIFIER_SOL_PATH,
-        SRS_PATH
+        settings_srs_path(SETTINGS_PATH)
     )
     print(f"   ✅ Verifier contract generated: {res}")
     print(f"   📄 Contract: {VERIFIER_SOL_PATH}")
@@ -217,7 +218,7 @@ Generated files:
   - ONNX Model:     {ONNX_PATH}
   - Settings:       {SETTINGS_PATH}
   - Compiled:       {COMPILED_PATH}
-  - SRS:            {SRS_PATH}
+  - SRS:            {settings_srs_path(SETTINGS_PATH)}
   - Proving Key:    {PK_PATH}
   - Verification Key: {VK_PATH}
   - Proof:          {PROOF_PATH}
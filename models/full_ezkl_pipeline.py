@@ -4,21 +4,91 @@ Complete EZKL Pipeline - Generates real ZK proofs for sentiment classification
 Run this in WSL2 with EZKL installed
 """
 import os
-import json
+import orjson
+import importlib.util
+import asyncio
 import numpy as np
+from pathlib import Path
+
+# ezkl's Rayon pool (witness FFTs, MSMs in prove) defaults to one thread per logical CPU;
+# hyperthread siblings share execution units, so size it to physical cores instead.
+# Both variables are read when ezkl loads, so they must be set before the import.
+_core_siblings = {p.read_text().strip() for p in Path("/sys/devices/system/cpu").glob("cpu[0-9]*/topology/thread_siblings_list")}
+os.environ.setdefault("RAYON_NUM_THREADS", str(len(_core_siblings) or os.cpu_count() or 1))
+# Large OS pages for the multi-hundred-MB proving key cut TLB misses during prove
+os.environ.setdefault("MIMALLOC_ALLOW_LARGE_OS_PAGES", "1")
+
+import ezkl
+from witness_cache import cached_gen_witness
+from ezkl_srs import (srs_path_for, write_file, file_stamp, files_hash, sig_matches, write_sig,
+                      circuit_hash, keys_cached, write_keys_manifest, map_warm)
 
 # All paths in the models directory
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ONNX_PATH = os.path.join(SCRIPT_DIR, "sentiment.onnx")
-INPUT_PATH = os.path.join(SCRIPT_DIR, "input.json")
-SETTINGS_PATH = os.path.join(SCRIPT_DIR, "settings.json")
-COMPILED_PATH = os.path.join(SCRIPT_DIR, "model.compiled")
-WITNESS_PATH = os.path.join(SCRIPT_DIR, "witness.json")
-SRS_PATH = os.path.join(SCRIPT_DIR, "kzg.srs")
-PK_PATH = os.path.join(SCRIPT_DIR, "pk.key")
-VK_PATH = os.path.join(SCRIPT_DIR, "vk.key")
-PROOF_PATH = os.path.join(SCRIPT_DIR, "proof.json")
-VERIFIER_SOL_PATH = os.path.join(SCRIPT_DIR, "Verifier.sol")
+SCRIPT_DIR = Path(__file__).resolve().parent
+ONNX_PATH = SCRIPT_DIR / "sentiment.onnx"
+INPUT_PATH = SCRIPT_DIR / "input.json"
+SETTINGS_PATH = SCRIPT_DIR / "settings.json"
+COMPILED_PATH = SCRIPT_DIR / "model.compiled"
+WITNESS_PATH = SCRIPT_DIR / "witness.json"
+PK_PATH = SCRIPT_DIR / "pk.key"
+VK_PATH = SCRIPT_DIR / "vk.key"
+PROOF_PATH = SCRIPT_DIR / "proof.json"
+VERIFIER_SOL_PATH = SCRIPT_DIR / "Verifier.sol"
+
+# Set EZKL_VERBOSE=1 to parse and summarize witness/proof contents after each step
+VERBOSE = os.environ.get("EZKL_VERBOSE") == "1"
+
+# Everything the deterministic model/input depend on - bump when changing them
+MODEL_SIG = "seed=42,arch=16-8-3,opset=13,eval"
+INPUT_SIG = "rng=default_rng(123),shape=16"
+
+
+def file_size(path):
+    """Size of path from a single stat() call, 0 if it does not exist"""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _load(path):
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _dump(obj, path):
+    write_file(path, orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+def model_sig(simplified):
+    """Model recipe plus whether onnxsim actually ran on it"""
+    return f"{MODEL_SIG},{'simplified' if simplified else 'unsimplified'}"
+
+
+def simplify_onnx(path):
+    """
+    Fold constants and drop dead nodes/initializers so the circuit has fewer constraints.
+    Returns True only if onnxsim simplified the model.
+    """
+    import onnx
+    
+    model = onnx.load(path)
+    try:
+        import onnxsim
+        model, ok = onnxsim.simplify(model)
+        if not ok:
+            print("   ⚠️ onnxsim could not validate the simplified model, keeping the export")
+            return False
+    except ImportError:
+        # Without onnxsim at least strip initializers no node reads
+        used = {name for node in model.graph.node for name in node.input}
+        unused = [init for init in model.graph.initializer if init.name not in used]
+        for init in unused:
+            model.graph.initializer.remove(init)
+        onnx.save(model, path)
+        return False
+    onnx.save(model, path)
+    return True
 
 
 def step1_create_model():
@@ -27,39 +97,22 @@ def step1_create_model():
     print("[STEP 1] Creating ONNX Model")
     print("="*60)
     
-    import torch
-    import torch.nn as nn
+    # Same seed and architecture always export the same model, so skip rebuilding it -
+    # unless it was saved unsimplified and onnxsim is now installed
+    if sig_matches(ONNX_PATH, model_sig(importlib.util.find_spec("onnxsim") is not None)):
+        print(f"   ♻️  Reusing cached model: {ONNX_PATH}")
+        return True
     
-    class SimpleSentiment(nn.Module):
-        def __init__(self):
-            super().__init__()
-            # Simple 2-layer network: 16 -> 8 -> 3
-            self.fc1 = nn.Linear(16, 8)
-            self.fc2 = nn.Linear(8, 3)
-        
-        def forward(self, x):
-            x = torch.relu(self.fc1(x))
-            x = self.fc2(x)
-            return x
-    
-    # Create model with fixed weights
-    torch.manual_seed(42)
-    model = SimpleSentiment()
-    model.eval()
-    
-    # Export with opset 13 for maximum compatibility
-    dummy = torch.randn(1, 16)
-    torch.onnx.export(
-        model, dummy, ONNX_PATH,
-        input_names=['input'],
-        output_names=['output'],
-        opset_version=13,
-        do_constant_folding=True,
-        dynamo=False
-    )
+    # Graph and weights of the seeded torch export, built with onnx.helper (no torch import)
+    import onnx
+    from sentiment_model import build_sentiment_onnx
+    
+    onnx.save(build_sentiment_onnx(), ONNX_PATH)
+    simplified = simplify_onnx(ONNX_PATH)
+    write_sig(ONNX_PATH, model_sig(simplified))
     
     print(f"   ✅ Model saved: {ONNX_PATH}")
-    print(f"   📦 Size: {os.path.getsize(ONNX_PATH)} bytes")
+    print(f"   📦 Size: {ONNX_PATH.stat().st_size} bytes")
     return True
 
 
@@ -69,12 +122,16 @@ def step2_create_input():
     print("[STEP 2] Creating Input Data")
     print("="*60)
     
-    np.random.seed(123)  # Different seed for variety
-    data = np.random.randn(16).astype(np.float32).tolist()
+    if sig_matches(INPUT_PATH, INPUT_SIG):
+        print(f"   ♻️  Reusing cached input: {INPUT_PATH}")
+        return True
+    
+    rng = np.random.default_rng(123)  # Different seed for variety
+    data = rng.standard_normal(16, dtype=np.float32)
     
     input_json = {"input_data": [data]}
-    with open(INPUT_PATH, 'w') as f:
-        json.dump(input_json, f, indent=2)
+    _dump(input_json, INPUT_PATH)
+    write_sig(INPUT_PATH, INPUT_SIG)
     
     print(f"   ✅ Input saved: {INPUT_PATH}")
     print(f"   Values: [{data[0]:.4f}, {data[1]:.4f}, ... {data[-1]:.4f}]")
@@ -87,14 +144,11 @@ def step3_gen_settings():
     print("[STEP 3] Generating Circuit Settings")
     print("="*60)
     
-    import ezkl
-    
     res = ezkl.gen_settings(ONNX_PATH, SETTINGS_PATH)
     print(f"   ✅ Settings generated: {res}")
     
     # Read settings and increase scale for better precision
-    with open(SETTINGS_PATH, 'r') as f:
-        settings = json.load(f)
+    settings = _load(SETTINGS_PATH)
     
     # Keep default settings - don't override to avoid SRS mismatch
     # The gen_settings function determines optimal values
@@ -103,10 +157,10 @@ def step3_gen_settings():
         logrows = settings['run_args'].get('logrows', 17)
         if logrows > 20:
             settings['run_args']['logrows'] = 20  # Cap at 20 to avoid huge SRS downloads
-    
-    # Save updated settings
-    with open(SETTINGS_PATH, 'w') as f:
-        json.dump(settings, f, indent=2)
+            
+            # Only rewrite when something changed, so the settings hash behind
+            # the cached keys stays tied to what gen_settings produced
+            _dump(settings, SETTINGS_PATH)
     
     run_args = settings.get('run_args', {})
     print(f"   logrows: {run_args.get('logrows')}")
@@ -122,44 +176,46 @@ def step4_compile(logrows):
     print("[STEP 4] Compiling Circuit")
     print("="*60)
     
-    import ezkl
-    
     res = ezkl.compile_circuit(ONNX_PATH, COMPILED_PATH, SETTINGS_PATH)
     print(f"   ✅ Circuit compiled: {res}")
-    print(f"   📦 Size: {os.path.getsize(COMPILED_PATH)} bytes")
+    print(f"   📦 Size: {COMPILED_PATH.stat().st_size} bytes")
     return True
 
 
-def step5_get_srs(logrows):
+async def step5_get_srs(logrows):
     """Download SRS"""
     print("\n" + "="*60)
     print("[STEP 5] Getting SRS (Structured Reference String)")
     print("="*60)
     
-    import ezkl
-    import asyncio
-    
-    async def get_srs():
-        return await ezkl.get_srs(SRS_PATH, logrows)
+    srs_path = Path(srs_path_for(logrows))
+    if file_size(srs_path) > 0:
+        print(f"   ♻️  Reusing cached SRS: {srs_path}")
+        return srs_path
     
-    res = asyncio.run(get_srs())
+    res = await ezkl.get_srs(srs_path, logrows)
     print(f"   ✅ SRS obtained: {res}")
-    print(f"   📦 Size: {os.path.getsize(SRS_PATH) / 1024 / 1024:.2f} MB")
-    return True
+    print(f"   📦 Size: {srs_path.stat().st_size / 1024 / 1024:.2f} MB")
+    return srs_path
 
 
-def step6_setup():
+def step6_setup(srs_path):
     """Generate proving and verification keys"""
     print("\n" + "="*60)
     print("[STEP 6] Generating Keys (PK and VK)")
     print("="*60)
     
-    import ezkl
+    current_hash = circuit_hash()
+    if keys_cached(current_hash, srs_path):
+        print(f"   ♻️  Circuit unchanged, reusing keys: {PK_PATH}, {VK_PATH}")
+        return True
     
-    res = ezkl.setup(COMPILED_PATH, VK_PATH, PK_PATH, SRS_PATH)
+    res = ezkl.setup(COMPILED_PATH, VK_PATH, PK_PATH, srs_path)
     print(f"   ✅ Keys generated: {res}")
-    print(f"   📦 PK size: {os.path.getsize(PK_PATH) / 1024 / 1024:.2f} MB")
-    print(f"   📦 VK size: {os.path.getsize(VK_PATH) / 1024:.2f} KB")
+    print(f"   📦 PK size: {PK_PATH.stat().st_size / 1024 / 1024:.2f} MB")
+    print(f"   📦 VK size: {VK_PATH.stat().st_size / 1024:.2f} KB")
+    
+    write_keys_manifest(current_hash, srs_path)
     return True
 
 
@@ -169,111 +225,129 @@ def step7_witness():
     print("[STEP 7] Generating Witness")
     print("="*60)
     
-    import ezkl
-    
-    res = ezkl.gen_witness(INPUT_PATH, COMPILED_PATH, WITNESS_PATH)
-    print(f"   ✅ Witness generated")
-    
-    # Show witness structure
-    with open(WITNESS_PATH, 'r') as f:
-        witness = json.load(f)
-    
-    inputs = witness.get('inputs', [[]])
-    outputs = witness.get('outputs', [[]])
-    print(f"   Inputs: {len(inputs[0])} field elements")
-    print(f"   Outputs: {len(outputs[0])} field elements")
+    if cached_gen_witness(INPUT_PATH, COMPILED_PATH, WITNESS_PATH):
+        print(f"   ♻️  Witness reused from cache")
+    else:
+        print(f"   ✅ Witness generated")
+    
+    # Witness size scales with logrows - only parse it when asked to
+    if VERBOSE:
+        witness = _load(WITNESS_PATH)
+        inputs = witness.get('inputs', [[]])
+        outputs = witness.get('outputs', [[]])
+        print(f"   Inputs: {len(inputs[0])} field elements")
+        print(f"   Outputs: {len(outputs[0])} field elements")
+    else:
+        print(f"   📦 Witness size: {WITNESS_PATH.stat().st_size / 1024:.2f} KB")
     
     return True
 
 
-def step8_prove():
+def step8_prove(srs_path):
     """Generate ZK proof"""
     print("\n" + "="*60)
     print("[STEP 8] Generating ZK Proof")
     print("="*60)
     
-    import ezkl
-    
     print("   Proving... (this may take a minute)")
-    res = ezkl.prove(WITNESS_PATH, COMPILED_PATH, PK_PATH, PROOF_PATH, SRS_PATH)
+    res = ezkl.prove(WITNESS_PATH, COMPILED_PATH, PK_PATH, PROOF_PATH, srs_path)
     print(f"   ✅ Proof generated")
-    print(f"   📦 Proof size: {os.path.getsize(PROOF_PATH) / 1024:.2f} KB")
+    print(f"   📦 Proof size: {PROOF_PATH.stat().st_size / 1024:.2f} KB")
     
     # Show proof structure
-    with open(PROOF_PATH, 'r') as f:
-        proof = json.load(f)
-    print(f"   Proof keys: {list(proof.keys())}")
+    if VERBOSE:
+        proof = _load(PROOF_PATH)
+        print(f"   Proof keys: {list(proof.keys())}")
     
     return True
 
 
-def step9_verify():
+def step9_verify(srs_path):
     """Verify proof"""
     print("\n" + "="*60)
     print("[STEP 9] Verifying Proof")
     print("="*60)
     
-    import ezkl
-    
-    res = ezkl.verify(PROOF_PATH, SETTINGS_PATH, VK_PATH, SRS_PATH)
+    res = ezkl.verify(PROOF_PATH, SETTINGS_PATH, VK_PATH, srs_path)
     print(f"   ✅ Proof VERIFIED: {res}")
     return res
 
 
-def step10_solidity():
+async def step10_solidity(srs_path):
     """Generate Solidity verifier"""
     print("\n" + "="*60)
     print("[STEP 10] Generating Solidity Verifier")
     print("="*60)
     
-    import ezkl
-    
-    res = ezkl.create_evm_verifier(VK_PATH, SETTINGS_PATH, VERIFIER_SOL_PATH, SRS_PATH)
+    # Verifier.sol is a pure function of the VK and settings; its .sig records their hash
+    verifier_sig = files_hash(VK_PATH, SETTINGS_PATH)
+    if sig_matches(VERIFIER_SOL_PATH, verifier_sig):
+        print(f"   ♻️  Verifier up to date: {VERIFIER_SOL_PATH}")
+        return True
+    
+    before = file_stamp(VERIFIER_SOL_PATH)
+    res = await ezkl.create_evm_verifier(VK_PATH, SETTINGS_PATH, VERIFIER_SOL_PATH, srs_path)
+    after = file_stamp(VERIFIER_SOL_PATH)
+    if after is None or after == before:
+        print(f"   ❌ Verifier.sol was not regenerated: {res}")
+        return False
+    write_sig(VERIFIER_SOL_PATH, verifier_sig)
     print(f"   ✅ Verifier generated: {res}")
     print(f"   📄 Contract: {VERIFIER_SOL_PATH}")
     
     # Show contract size
-    if os.path.exists(VERIFIER_SOL_PATH):
-        size = os.path.getsize(VERIFIER_SOL_PATH)
+    size = file_size(VERIFIER_SOL_PATH)
+    if size:
         print(f"   📦 Size: {size / 1024:.2f} KB")
     
     return True
 
 
-def main():
+async def main():
     print("\n" + "="*60)
     print("   EZKL COMPLETE PIPELINE")
     print("   Real ZK Proofs for Sentiment Classification")
     print("="*60)
     
     try:
-        step1_create_model()
-        step2_create_input()
+        # Model export and input creation write disjoint files
+        await asyncio.gather(asyncio.to_thread(step1_create_model), asyncio.to_thread(step2_create_input))
         logrows = step3_gen_settings()
-        step4_compile(logrows)
-        step5_get_srs(logrows)
-        step6_setup()
+        
+        # SRS download is network-bound and only needs logrows, so overlap it with compilation
+        srs_path, _ = await asyncio.gather(step5_get_srs(logrows), asyncio.to_thread(step4_compile, logrows))
+        
+        # setup, prove, verify and step10 all read the SRS - keep it resident for the whole run
+        srs_mapping = map_warm(srs_path)
+        
+        step6_setup(srs_path)
         step7_witness()
-        step8_prove()
-        verified = step9_verify()
+        step8_prove(srs_path)
+        verified = step9_verify(srs_path)
         
         if verified:
-            step10_solidity()
+            await step10_solidity(srs_path)
             
             print("\n" + "="*60)
             print("   🎉 SUCCESS! Complete ZK pipeline working!")
             print("="*60)
-            print(f"""
-Generated files:
-  ✅ ONNX Model:      {ONNX_PATH}
-  ✅ Settings:        {SETTINGS_PATH}
-  ✅ Compiled:        {COMPILED_PATH}
-  ✅ SRS:             {SRS_PATH}
-  ✅ Proving Key:     {PK_PATH}
-  ✅ Verification Key: {VK_PATH}
-  ✅ Proof:           {PROOF_PATH}
-  ✅ Verifier.sol:    {VERIFIER_SOL_PATH}
-""")
+            
+            # One directory pass for every artifact size in the banner
+            with os.scandir(SCRIPT_DIR) as it:
+                sizes = {entry.name: entry.stat().st_size for entry in it if entry.is_file()}
+            print("\nGenerated files:")
+            for label, path in [
+                ("ONNX Model:", ONNX_PATH),
+                ("Settings:", SETTINGS_PATH),
+                ("Compiled:", COMPILED_PATH),
+                ("SRS:", srs_path),
+                ("Proving Key:", PK_PATH),
+                ("Verification Key:", VK_PATH),
+                ("Proof:", PROOF_PATH),
+                ("Verifier.sol:", VERIFIER_SOL_PATH),
+            ]:
+                print(f"  ✅ {label:<17} {path} ({sizes.get(path.name, 0) / 1024:.1f} KB)")
+            print()
             return True
         else:
             print("\n❌ Verification failed!")
@@ -287,5 +361,5 @@ Generated files:
 
 
 if __name__ == "__main__":
-    success = main()
+    success = asyncio.run(main())
     exit(0 if success else 1)
@@ -0,0 +1,63 @@
+"""
+Sentiment model for the EZKL pipeline, built without PyTorch
+The weights are nn.Linear(16, 8) and nn.Linear(8, 3) as initialised after
+torch.manual_seed(42), exported once and embedded here. The graph is the one
+torch.onnx.export (opset 13, eval, constant folding) produces for this model,
+so full_ezkl_pipeline never has to import torch.
+"""
+import numpy as np
+
+FC1_WEIGHT = [
+    [0.19113463, 0.20750198, -0.05856812, 0.22965282, -0.054775894, 0.050447673, -0.12171376, 0.14682066,
+     0.22038573, -0.18340704, 0.21729904, 0.046789825, 0.18470222, 0.033857644, 0.12054703, -0.03529775],
+    [0.19272146, 0.036952227, -0.11670998, 0.06372458, -0.11518416, -0.029318213, -0.10153958, 0.16584274,
+     -0.19734254, -0.115252584, -0.070593685, -0.15031812, 0.02359578, -0.24691978, 0.22577727, -0.21236706],
+    [0.19300684, 0.041604787, -0.08117613, 0.15448749, 0.038962692, 0.20199084, 0.027329922, -0.078843296,
+     0.06717092, -0.06779486, 0.10521439, 0.22320554, 0.14451489, -0.10929313, 0.14431617, 0.044731557],
+    [0.12695876, -0.15237626, -0.24747711, -0.09659013, -0.19175571, 0.20513472, 0.072007835, 0.103553385,
+     0.07906529, -0.0043489933, 0.19565207, -0.1776284, 0.015740931, -0.17063504, 0.077088, -0.08609557],
+    [0.07660407, -0.05208537, 0.20734796, -0.14817548, -0.1490995, -0.1491085, 0.2248607, 0.08331278,
+     0.24056268, -0.20631906, -0.24796903, -0.19559094, -0.16817227, 0.101260036, 0.089518964, 0.2077311],
+    [-0.12910634, -0.17042795, 0.13264453, -0.10105112, 0.15173095, -0.05932516, 0.14301148, -0.194242,
+     -0.12616244, 0.07621911, 0.052851886, -0.06373969, 0.14901736, 0.1699523, -0.18129334, -0.13346705],
+    [0.22891548, -0.084358126, -0.0886291, -0.24189866, -0.14316756, 0.062450916, -0.032998294, -0.1814715,
+     0.005864173, -0.17077038, -0.21209916, -0.13766566, -0.21880302, -0.15918452, 0.24990222, 0.04721874],
+    [0.07703993, -0.23317108, -0.16419345, -0.083213955, 0.03909278, -0.21998033, -0.10771826, -0.14966714,
+     0.0006928146, -0.0930258, -0.017323941, -0.16940743, -0.17159879, -0.14585045, -0.08557436, -0.19732022],
+]
+FC1_BIAS = [0.20961747, -0.04961601, 0.21509919, 0.07789552, -0.21169925, 0.1730088, -0.068786204, -0.09583151]
+FC2_WEIGHT = [
+    [-0.29347423, -0.35148886, 0.101155385, -0.07723157, 0.13764651, -0.29014835, 0.26248834, -0.25952718],
+    [-0.061049245, 0.073846586, 0.18252257, 0.2854273, 0.3220727, -0.2803403, 0.08897781, -0.15207249],
+    [-0.03874408, -0.2646312, 0.32203716, -0.25949067, 0.18895705, 0.12425266, 0.11488927, -0.1911473],
+]
+FC2_BIAS = [0.32136288, 0.0776935, 0.045481127]
+
+
+def build_sentiment_onnx():
+    """Return the 16 -> 8 -> 3 MLP as an ONNX ModelProto"""
+    from onnx import helper, numpy_helper, TensorProto
+    
+    initializers = [
+        numpy_helper.from_array(np.array(FC1_WEIGHT, dtype=np.float32), name='fc1.weight'),
+        numpy_helper.from_array(np.array(FC1_BIAS, dtype=np.float32), name='fc1.bias'),
+        numpy_helper.from_array(np.array(FC2_WEIGHT, dtype=np.float32), name='fc2.weight'),
+        numpy_helper.from_array(np.array(FC2_BIAS, dtype=np.float32), name='fc2.bias'),
+    ]
+    # nn.Linear exports as Gemm with the [out, in] weight transposed
+    nodes = [
+        helper.make_node('Gemm', ['input', 'fc1.weight', 'fc1.bias'], ['/fc1/Gemm_output_0'],
+                         name='/fc1/Gemm', alpha=1.0, beta=1.0, transB=1),
+        helper.make_node('Relu', ['/fc1/Gemm_output_0'], ['/Relu_output_0'], name='/Relu'),
+        helper.make_node('Gemm', ['/Relu_output_0', 'fc2.weight', 'fc2.bias'], ['output'],
+                         name='/fc2/Gemm', alpha=1.0, beta=1.0, transB=1),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        'main_graph',
+        [helper.make_tensor_value_info('input', TensorProto.FLOAT, [1, 16])],
+        [helper.make_tensor_value_info('output', TensorProto.FLOAT, [1, 3])],
+        initializers
+    )
+    # Same IR version torch writes, which ezkl's ONNX loader accepts
+    return helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)], ir_version=7)
@@ -8,9 +8,12 @@ This script:
 
 import os
 import json
-import numpy as np
-import ezkl
+import orjson
 import asyncio
+from ezkl_srs import settings_logrows, settings_srs_path, circuit_hash, keys_cached, write_keys_manifest
+
+# numpy, ezkl and torch are imported inside the steps that use them, so runs
+# that find cached artifacts never pay for loading them
 
 # Paths
 MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -80,19 +83,20 @@ def create_onnx_model():
 def create_onnx_model_without_torch():
     """Create ONNX model without PyTorch using onnx library"""
     try:
+        import numpy as np
         import onnx
         from onnx import helper, TensorProto, numpy_helper
         
         # Define model architecture
         # Input: [1, 16] -> FC1 -> ReLU -> FC2 -> Output: [1, 3]
         
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         
-        # Weights
-        w1 = np.random.randn(16, 8).astype(np.float32) * 0.1
-        b1 = np.zeros(8).astype(np.float32)
-        w2 = np.random.randn(8, 3).astype(np.float32) * 0.1
-        b2 = np.zeros(3).astype(np.float32)
+        # Weights, drawn as float32 directly
+        w1 = rng.standard_normal((16, 8), dtype=np.float32) * np.float32(0.1)
+        b1 = np.zeros(8, dtype=np.float32)
+        w2 = rng.standard_normal((8, 3), dtype=np.float32) * np.float32(0.1)
+        b2 = np.zeros(3, dtype=np.float32)
         
         # Create initializers
         w1_init = numpy_helper.from_array(w1, name='fc1.weight')
@@ -131,22 +135,24 @@ def create_calibration_data():
     """Create calibration data for EZKL"""
     print("\n📊 Step 2: Creating Calibration Data...")
     
-    np.random.seed(42)
+    import numpy as np
+    
+    rng = np.random.default_rng(42)
     
-    # Create sample inputs that represent different sentiments
-    calibration_data = {
-        "input_data": [
-            # Bearish-like patterns
-            np.random.randn(1, 16).tolist()[0],
-            # Neutral-like patterns  
-            np.zeros(16).tolist(),
-            # Bullish-like patterns
-            np.random.randn(1, 16).tolist()[0],
-        ]
-    }
+    # Create sample inputs that represent different sentiments in one draw:
+    # bearish-like, neutral-like (all zeros) and bullish-like patterns
+    samples = rng.standard_normal((3, 16), dtype=np.float32)
+    samples[1] = 0
+    calibration_data = {"input_data": samples}
     
-    with open(CALIBRATION_PATH, 'w') as f:
-        json.dump(calibration_data, f, indent=2)
+    # Unbuffered write of the serialized bytes, looping in case of a partial write
+    fd = os.open(CALIBRATION_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(orjson.dumps(calibration_data, option=orjson.OPT_SERIALIZE_NUMPY))
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
     
     print(f"   ✅ Calibration data saved to: {CALIBRATION_PATH}")
     return True
@@ -156,6 +162,8 @@ async def setup_ezkl():
     """Setup EZKL proving system"""
     print("\n🔐 Step 3: Setting up EZKL...")
     
+    import ezkl
+    
     # Generate settings
     print("   Generating settings...")
     res = ezkl.gen_settings(ONNX_PATH, SETTINGS_PATH)
@@ -178,20 +186,29 @@ async def setup_ezkl():
     
     # Use pre-downloaded SRS file (downloaded from trusted-setup-halo2kzg.s3.eu-central-1.amazonaws.com)
     print("   Using pre-downloaded SRS...")
-    srs_path = os.path.join(MODEL_DIR, "kzg.srs")
+    logrows = settings_logrows(SETTINGS_PATH)
+    srs_path = settings_srs_path(SETTINGS_PATH)
     
     # Verify SRS file exists
     if not os.path.exists(srs_path):
         print(f"   ❌ SRS file not found at {srs_path}")
-        print("   Download it with: Invoke-WebRequest -Uri 'https://trusted-setup-halo2kzg.s3.eu-central-1.amazonaws.com/perpetual-powers-of-tau-raw-15' -OutFile 'models/kzg.srs'")
+        print(f"   Download it with: Invoke-WebRequest -Uri 'https://trusted-setup-halo2kzg.s3.eu-central-1.amazonaws.com/perpetual-powers-of-tau-raw-{logrows}' -OutFile 'models/kzg_{logrows}.srs'")
         return False
     print(f"   📦 SRS file size: {os.path.getsize(srs_path)} bytes")
     
+    # Regenerated settings/circuit can be byte-identical - keep the keys then
+    current_hash = circuit_hash()
+    if keys_cached(current_hash, srs_path):
+        print("   ♻️  Circuit unchanged, reusing proving keys")
+        return True
+    
     # Setup (generate proving and verification keys)
     print("   Generating proving keys (this may take a minute)...")
     res = await ezkl.setup(COMPILED_PATH, VK_PATH, PK_PATH, srs_path)
     print(f"   ✅ Keys generated: {res}")
     
+    write_keys_manifest(current_hash, srs_path)
+    
     return True
 
 
@@ -199,14 +216,17 @@ async def test_proof_generation():
     """Test generating and verifying a proof"""
     print("\n🧪 Step 4: Testing Proof Generation...")
     
+    import ezkl
+    import numpy as np
+    
     # Create test input
-    np.random.seed(123)
-    test_input = np.random.randn(1, 16).tolist()
+    rng = np.random.default_rng(123)
+    test_input = rng.standard_normal((1, 16), dtype=np.float32)
     
     input_data = {"input_data": test_input}
     input_path = os.path.join(MODEL_DIR, "test_input.json")
-    with open(input_path, 'w') as f:
-        json.dump(input_data, f)
+    with open(input_path, 'wb') as f:
+        f.write(orjson.dumps(input_data, option=orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"   Test input: {test_input[0][:4]}... (showing first 4 values)")
     
@@ -261,6 +281,8 @@ async def generate_solidity_verifier():
     """Generate Solidity verifier contract"""
     print("\n📝 Step 5: Generating Solidity Verifier...")
     
+    import ezkl
+    
     res = await ezkl.create_evm_verifier(
         VK_PATH,
         SETTINGS_PATH,
@@ -294,11 +316,11 @@ async def main():
     else:
         print(f"\n📊 Step 2: Calibration data already exists")
     
-    # Step 3: Setup EZKL
-    if not os.path.exists(PK_PATH):
+    # Step 3: Setup EZKL (keys are only reused if they match the current circuit)
+    if not keys_cached(circuit_hash(), settings_srs_path(SETTINGS_PATH)):
         await setup_ezkl()
     else:
-        print(f"\n🔐 Step 3: EZKL keys already exist")
+        print(f"\n🔐 Step 3: EZKL keys already exist for this circuit")
     
     # Step 4: Test proof generation
     result = await test_proof_generation()
@@ -0,0 +1,51 @@
+"""
+Witness cache for EZKL scripts
+gen_witness is deterministic in (input, compiled circuit), so repeat runs can reuse
+an earlier witness. Enabled with EZKL_WITNESS_CACHE=1.
+"""
+import functools
+import hashlib
+import os
+import shutil
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WITNESS_CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache", "witness")
+WITNESS_CACHE_ENABLED = os.environ.get("EZKL_WITNESS_CACHE") == "1"
+
+
+def witness_key(input_path, compiled_path):
+    """Cache key over the exact input and circuit bytes"""
+    digest = hashlib.sha256()
+    for path in (input_path, compiled_path):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_witness_path(key, input_path, compiled_path):
+    """Return the cache file for key, generating the witness on a miss"""
+    cached_path = os.path.join(WITNESS_CACHE_DIR, f"{key}.json")
+    if not os.path.exists(cached_path):
+        import ezkl
+        os.makedirs(WITNESS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cached_path}.{os.getpid()}.tmp"
+        ezkl.gen_witness(input_path, compiled_path, tmp_path)
+        os.replace(tmp_path, cached_path)
+    return cached_path
+
+
+def cached_gen_witness(input_path, compiled_path, witness_path):
+    """
+    Drop-in for ezkl.gen_witness that writes witness_path.
+    Returns True when the witness came from the cache.
+    """
+    if not WITNESS_CACHE_ENABLED:
+        import ezkl
+        ezkl.gen_witness(input_path, compiled_path, witness_path)
+        return False
+
+    key = witness_key(input_path, compiled_path)
+    hit = os.path.exists(os.path.join(WITNESS_CACHE_DIR, f"{key}.json"))
+    shutil.copyfile(_cached_witness_path(key, input_path, compiled_path), witness_path)
+    return hit